@@ -827,17 +827,17 @@ class EvalTrace(Trace):
   def process_custom_transpose(self, primitive, call, tracers, **_):
     del primitive, _
     with new_sublevel():
-      return call.call_wrapped(*tracers)
+      return call._call(tracers)
 
   def process_custom_jvp_call(self, primitive, fun, jvp, tracers, **_):
     del primitive, jvp, _  # Unused.
     with new_sublevel():
-      return fun.call_wrapped(*tracers)
+      return fun._call(tracers)
 
   def process_custom_vjp_call(self, primitive, fun, fwd, bwd, tracers, **_):  # pytype: disable=signature-mismatch
     del primitive, fwd, bwd, _  # Unused.
     with new_sublevel():
-      return fun.call_wrapped(*tracers)
+      return fun._call(tracers)
 
 
 class MainTrace:
@@ -2180,7 +2180,7 @@ def trace_to_subjaxpr_dynamic(
     trace = DynamicJaxprTrace(main, core.cur_sublevel())
     in_tracers = _input_type_to_tracers(trace.new_arg, in_avals)
     in_tracers_ = [t for t, keep in zip(in_tracers, keep_inputs) if keep]
-    ans = fun.call_wrapped(*in_tracers_)
+    ans = fun._call(in_tracers_)
     out_tracers = map(trace.full_raise, ans)
     jaxpr, consts = frame.to_jaxpr(out_tracers)
     del fun, main, trace, frame, in_tracers, out_tracers, ans
@@ -2209,7 +2209,7 @@ def trace_to_subjaxpr_dynamic2(
     trace = DynamicJaxprTrace(main, core.cur_sublevel())
     in_tracers = _input_type_to_tracers(trace.new_arg, in_avals)
     in_tracers_ = [t for t, keep in zip(in_tracers, keep_inputs) if keep]
-    ans = fun.call_wrapped(*in_tracers_)
+    ans = fun._call(in_tracers_)
     out_tracers = map(trace.full_raise, ans)
     jaxpr, out_type, consts = frame.to_jaxpr2(out_tracers)
     del fun, main, trace, frame, in_tracers, out_tracers, ans
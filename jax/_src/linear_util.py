@@ -63,14 +63,13 @@ data must be immutable, because it will be stored in function memoization tables
 """
 from __future__ import annotations
 
-from functools import partial
-import operator
+import sys
 from typing import Any, Callable, NamedTuple
 import weakref
 
-from jax._src.tree_util import tree_map
 from jax._src.config import config
 from jax._src import core
+from jax._src import tree_util
 from jax._src import traceback_util
 from jax._src.util import curry
 
@@ -83,6 +82,9 @@ class StoreException(Exception): pass
 class EmptyStoreValue: pass
 _EMPTY_STORE_VALUE = EmptyStoreValue()
 
+# Returned by cache lookups in `cache` to tell a miss from any cached value.
+_cache_miss = object()
+
 class Store:
   """Storage for a value, with checks for overwriting or reading empty store."""
   __slots__ = ("_val",)
@@ -101,38 +103,55 @@ class Store:
 
   @property
   def val(self):
-    if not self:
+    val = self._val
+    if val is _EMPTY_STORE_VALUE:
       raise StoreException("Store empty")
-    return self._val
+    return val
 
-  def __nonzero__(self):
+  def __bool__(self):
     return self._val is not _EMPTY_STORE_VALUE
 
-  __bool__ = __nonzero__
-
 class EqualStore:
   __slots__ = ('_store',)
 
   def __init__(self):
     self._store = Store()
 
-  val = property(operator.attrgetter('_store.val'))
+  @property
+  def val(self):
+    val = self._store._val
+    if val is _EMPTY_STORE_VALUE:
+      raise StoreException("Store empty")
+    return val
 
   def store(self, val):
+    store = self._store
+    if store._val is _EMPTY_STORE_VALUE:
+      store._val = val
+      return
     try:
-      self._store.store(val)
-    except StoreException as e:
-      try:
-        okay = bool(self._store._val == val)
-      except:
-        raise e from None
-      else:
-        if not okay:
-          raise StoreException("Store occupied with not-equal value") from None
+      okay = bool(store._val == val)
+    except:
+      raise StoreException("Store occupied") from None
+    if not okay:
+      raise StoreException("Store occupied with not-equal value")
 
   def reset(self):
     self._store.reset()
 
+  def __bool__(self):
+    return self._store._val is not _EMPTY_STORE_VALUE
+
+
+# Shared read-only empty dict, used for WrappedFuns without params and as the
+# default kwargs of WrappedFun._call; never mutated.
+_EMPTY_DICT: dict[str, Any] = {}
+
+def _merge_params(params, kwargs):
+  """Merges call-time `kwargs` over a WrappedFun's `params` dict."""
+  if not kwargs:
+    return params
+  return {**params, **kwargs} if params else kwargs
 
 class WrappedFun:
   """Represents a function `f` to which `transforms` are to be applied.
@@ -148,15 +167,64 @@ class WrappedFun:
     params: extra parameters to pass as keyword arguments to `f`, along with the
       transformed keyword arguments.
   """
-  __slots__ = ("f", "transforms", "stores", "params", "in_type", "debug_info")
+  __slots__ = ("f", "_transforms", "_stores", "_parent", "params",
+               "_params_dict", "in_type", "debug_info", "_hash")
 
-  def __init__(self, f, transforms, stores, params, in_type, debug_info):
+  def __init__(self, f, transforms, stores, params, in_type, debug_info,
+               params_dict=None):
     self.f = f
-    self.transforms = transforms
-    self.stores = stores
+    self._transforms = transforms
+    self._stores = stores
+    # Set only on WrappedFuns built by `wrap`; see there.
+    self._parent = None
     self.params = params
+    # `params` as a dict, for merging into kwargs at call time. Derived
+    # WrappedFuns share their parent's dict rather than rebuilding it.
+    if params_dict is None:
+      params_dict = dict(params) if params else _EMPTY_DICT
+    self._params_dict = params_dict
     self.in_type = in_type
     self.debug_info = debug_info
+    # Computed lazily by __hash__; WrappedFuns are not mutated after
+    # construction, so the hash can be cached for the lifetime of the object.
+    self._hash = None
+
+  # Code in this module reads `_transforms` / `_stores` directly, calling
+  # `_materialize` only when they are None, to keep the properties off the
+  # `call_wrapped` and `cache` hot paths.
+  @property
+  def transforms(self):
+    if self._transforms is None:
+      self._materialize()
+    return self._transforms
+
+  @property
+  def stores(self):
+    if self._stores is None:
+      self._materialize()
+    return self._stores
+
+  def _materialize(self):
+    # Another thread may be materializing the same WrappedFuns concurrently.
+    # Readers treat a non-None `_transforms` as meaning both tuples are ready,
+    # so `_stores` is written first and `_parent` is only cleared afterwards.
+    transforms, stores = [], []
+    fun = self
+    while True:
+      fun_transforms = fun._transforms
+      if fun_transforms is not None:
+        break
+      parent = fun._parent
+      if parent is None:
+        continue  # `fun` was just materialized by another thread
+      transform, out_store, fun = parent
+      transforms.append(transform)
+      stores.append(out_store)
+    all_stores = tuple(stores) + fun._stores
+    all_transforms = tuple(transforms) + fun_transforms
+    self._stores = all_stores
+    self._transforms = all_transforms
+    self._parent = None
 
   @property
   def __name__(self):
@@ -164,12 +232,27 @@ class WrappedFun:
 
   def wrap(self, gen, gen_static_args, out_store) -> WrappedFun:
     """Add another transform and its store."""
-    return WrappedFun(self.f, ((gen, gen_static_args),) + self.transforms,
-                      (out_store,) + self.stores, self.params, None, None)
+    # Rather than copying the whole transform stack, record the new transform
+    # and a pointer to `self` in `_parent`; `_materialize` builds the
+    # `transforms` and `stores` tuples when they are first read. This keeps
+    # `wrap` O(1). `_transforms` is None exactly when `_parent` is set, so this
+    # bypasses the constructor, which only takes materialized tuples.
+    fun = object.__new__(WrappedFun)
+    fun.f = self.f
+    fun._transforms = fun._stores = None
+    fun._parent = ((gen, gen_static_args), out_store, self)
+    fun.params = self.params
+    fun._params_dict = self._params_dict
+    fun.in_type = fun.debug_info = fun._hash = None
+    return fun
 
   def populate_stores(self, stores):
     """Copy the values from the `stores` into `self.stores`."""
-    for self_store, other_store in zip(self.stores, stores):
+    self_stores = self._stores
+    if self_stores is None:
+      self._materialize()
+      self_stores = self._stores
+    for self_store, other_store in zip(self_stores, stores):
       if self_store is not None:
         self_store.store(other_store.val)
 
@@ -179,15 +262,52 @@ class WrappedFun:
     The positional `args` and keyword `kwargs` are passed to the first
     transformation generator.
     """
+    return self._call(args, kwargs)
+
+  def _call(self, args, kwargs=_EMPTY_DICT):
+    """Like `call_wrapped`, but takes already-built `args` and `kwargs`.
+
+    Internal callers that already hold a sequence of arguments use this to skip
+    packing them into a fresh tuple and dict at the call boundary.
+    """
+    params = self._params_dict
+    transforms = self._transforms
+    if transforms is None:
+      self._materialize()
+      transforms = self._transforms
+    if not transforms:
+      # Fast path for the common case of a function with no transformations.
+      return self.f(*args, **_merge_params(params, kwargs))
+
+    if len(transforms) == 1:
+      # Same as the general case below, without the stack bookkeeping.
+      (gen, gen_static_args), = transforms
+      out_store, = self._stores
+      gen = gen(*gen_static_args, *args, **kwargs)
+      args, kwargs = next(gen)
+      try:
+        ans = self.f(*args, **_merge_params(params, kwargs))
+      except:
+        gen.close()
+        raise
+      args = kwargs = None
+      ans = gen.send(ans)
+      if out_store is not None:
+        ans, side = ans
+        out_store.store(side)
+      return ans
+
+    # Only the generators go on the stack; each is paired with its out_store
+    # when unwinding, which walks the stores in the same (reversed) order.
     stack = []
-    for (gen, gen_static_args), out_store in zip(self.transforms, self.stores):
-      gen = gen(*(gen_static_args + tuple(args)), **kwargs)
+    for gen, gen_static_args in transforms:
+      gen = gen(*gen_static_args, *args, **kwargs)
       args, kwargs = next(gen)
-      stack.append((gen, out_store))
-    gen = gen_static_args = out_store = None
+      stack.append(gen)
+    gen = gen_static_args = None
 
     try:
-      ans = self.f(*args, **dict(self.params, **kwargs))
+      ans = self.f(*args, **_merge_params(params, kwargs))
     except:
       # Some transformations yield from inside context managers, so we have to
       # interrupt them before reraising the exception. Otherwise they will only
@@ -195,12 +315,12 @@ class WrappedFun:
       # only after this exception is handled, which can corrupt the global
       # state.
       while stack:
-        stack.pop()[0].close()
+        stack.pop().close()
       raise
 
     args = kwargs = None
-    while stack:
-      gen, out_store = stack.pop()
+    for out_store in reversed(self._stores):
+      gen = stack.pop()
       try:
         ans = gen.send(ans)
       except:
@@ -208,7 +328,7 @@ class WrappedFun:
         # raised in the second half of the transformation also require us to
         # clean up references here.
         while stack:
-          stack.pop()[0].close()
+          stack.pop().close()
         raise
       if out_store is not None:
         ans, side = ans
@@ -224,13 +344,24 @@ class WrappedFun:
     return "Wrapped function:\n" + '\n'.join(transformation_stack) + '\nCore: ' + fun_name(self.f) + '\n'
 
   def __hash__(self):
-    return hash((self.f, self.transforms, self.params, self.in_type,
-                 self.debug_info))
+    h = self._hash
+    if h is None:
+      h = self._hash = hash((self.f, self.transforms, self.params, self.in_type,
+                             self.debug_info))
+    return h
 
   def __eq__(self, other):
-    return (self.f == other.f and self.transforms == other.transforms and
-            self.params == other.params and self.in_type == other.in_type and
-            self.debug_info == other.debug_info)
+    if self is other:
+      return True
+    if type(other) is not WrappedFun:
+      return NotImplemented
+    if (self._hash is not None and other._hash is not None and
+        self._hash != other._hash):
+      return False
+    # Compare the cheap fields first, leaving the transforms stack for last.
+    return (self.in_type == other.in_type and self.params == other.params and
+            self.debug_info == other.debug_info and self.f == other.f and
+            self.transforms == other.transforms)
 
 @curry
 def transformation(gen, fun: WrappedFun, *gen_static_args) -> WrappedFun:
@@ -248,6 +379,7 @@ def transformation_with_aux(gen, fun: WrappedFun, *gen_static_args,
   """Adds one more transformation with auxiliary output to a WrappedFun."""
   out_store = Store() if not use_eq_store else EqualStore()
   out_thunk = lambda: out_store.val
+  out_thunk.store = out_store  # type: ignore  # read by merge_linear_aux
   return fun.wrap(gen, gen_static_args, out_store), out_thunk
 
 def fun_name(f):
@@ -258,8 +390,14 @@ def fun_name(f):
 
 def wrap_init(f, params=None) -> WrappedFun:
   """Wraps function `f` as a `WrappedFun`, suitable for transformation."""
-  params = () if params is None else tuple(sorted(params.items()))
-  return WrappedFun(f, (), (), params, None, None)
+  if not params:
+    return WrappedFun(f, (), (), (), None, None, _EMPTY_DICT)
+  params_dict = dict(params)
+  if len(params) == 1:
+    params = tuple(params_dict.items())
+  else:
+    params = tuple(sorted(params_dict.items()))
+  return WrappedFun(f, (), (), params, None, None, params_dict)
 
 
 def annotate(f: WrappedFun, in_type: core.InputType | None) -> WrappedFun:
@@ -267,37 +405,46 @@ def annotate(f: WrappedFun, in_type: core.InputType | None) -> WrappedFun:
   if in_type is None:
     return f
   _check_input_type(in_type)
-  return WrappedFun(f.f, f.transforms, f.stores, f.params, in_type, f.debug_info)
+  return WrappedFun(f.f, f.transforms, f.stores, f.params, in_type,
+                    f.debug_info, f._params_dict)
 
 def _check_input_type(in_type: core.InputType) -> None:
-  # Check that in_type is syntactically well-formed
-  assert type(in_type) is tuple and all(type(e) is tuple for e in in_type)
-  assert all(isinstance(a, core.AbstractValue) and type(b) is bool
-             and not isinstance(a, core.ConcreteArray) for a, b in in_type)
-
-  def valid_size(d) -> bool:
-    if isinstance(d, core.DBIdx) and type(d.val) is int and d.val >= 0:
-      return True
-    return (isinstance(d, (int, core.DBIdx, core.DArray)) and
-            (not isinstance(d, core.DArray) or type(d) is core.bint and not d.shape))
-  assert all(valid_size(d) for a, _ in in_type if type(a) is core.DShapedArray
-             for d in a.shape)
+  # The checks below are all assertions, so skip the loops entirely under -O.
+  if not __debug__:
+    return
 
-  # Check that all DBIdx point to positions to the left of the input on which
-  # they appear.
-  assert all(d.val < i for i, (aval, _) in enumerate(in_type)
-             if isinstance(aval, core.DShapedArray) for d in aval.shape
-             if isinstance(d, core.DBIdx))
+  # Check that in_type is syntactically well-formed
+  assert type(in_type) is tuple
+  for e in in_type:
+    assert type(e) is tuple
+    a, b = e
+    assert (isinstance(a, core.AbstractValue) and type(b) is bool
+            and not isinstance(a, core.ConcreteArray))
 
-  # Check that all implicit arguments have at least one DBIdx pointing to them.
   provided = [e for _, e in in_type]
-  for aval, _ in in_type:
-    if type(aval) is core.DShapedArray:
-      for d in aval.shape:
-        if isinstance(d, core.DBIdx):
+  for i, (aval, _) in enumerate(in_type):
+    if not isinstance(aval, core.DShapedArray):
+      continue
+    is_dshaped = type(aval) is core.DShapedArray
+    for d in aval.shape:
+      if is_dshaped:
+        assert _valid_size(d)
+      if isinstance(d, core.DBIdx):
+        # Check that all DBIdx point to positions to the left of the input on
+        # which they appear.
+        assert d.val < i
+        if is_dshaped:
           provided[d.val] = True
+
+  # Check that all implicit arguments have at least one DBIdx pointing to them.
   assert all(provided)
 
+def _valid_size(d) -> bool:
+  if isinstance(d, core.DBIdx) and type(d.val) is int and d.val >= 0:
+    return True
+  return (isinstance(d, (int, core.DBIdx, core.DArray)) and
+          (not isinstance(d, core.DArray) or type(d) is core.bint and not d.shape))
+
 
 class TracingDebugInfo(NamedTuple):
   # Packages up trace/staging-time debug info about a func and its parameters,
@@ -314,7 +461,14 @@ def add_debug_info(f: WrappedFun, debug_info: TracingDebugInfo | None
   assert f.debug_info is None
   if debug_info is None:
     return f
-  return WrappedFun(f.f, f.transforms, f.stores, f.params, f.in_type, debug_info)
+  # Debug info takes part in WrappedFun hashing and equality, and the same
+  # names recur across many traces, so intern the strings to make those
+  # comparisons identity checks and to share the string objects.
+  debug_info = TracingDebugInfo(
+      sys.intern(debug_info.traced_for), sys.intern(debug_info.func_src_info),
+      tuple(map(sys.intern, debug_info.arg_names)), debug_info.result_paths)
+  return WrappedFun(f.f, f.transforms, f.stores, f.params, f.in_type,
+                    debug_info, f._params_dict)
 
 
 def cache(call: Callable):
@@ -331,21 +485,26 @@ def cache(call: Callable):
   fun_caches: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
 
   def memoized_fun(fun: WrappedFun, *args):
-    cache = fun_caches.setdefault(fun.f, {})
+    # Probe with get() first: WeakKeyDictionary.setdefault allocates both a new
+    # callback-carrying weakref and the default dict on every call, hit or miss.
+    cache = fun_caches.get(fun.f)
+    if cache is None:
+      cache = fun_caches[fun.f] = {}
+    transforms = fun._transforms
+    if transforms is None:
+      fun._materialize()
+      transforms = fun._transforms
     if config.jax_check_tracer_leaks:
-      key = (_copy_main_traces(fun.transforms), fun.params, fun.in_type, args,
-             config.x64_enabled, config.jax_default_device,
-             config._trace_context())
+      transforms = _copy_main_traces(transforms)
+    key = (transforms, fun.params, fun.in_type, args, config.x64_enabled,
+           config.jax_default_device, config._trace_context())
+    result = cache.get(key, _cache_miss)
+    if result is _cache_miss:
+      ans = call(fun, *args)
+      cache[key] = (ans, fun._stores)
     else:
-      key = (fun.transforms, fun.params, fun.in_type, args, config.x64_enabled,
-             config.jax_default_device, config._trace_context())
-    result = cache.get(key, None)
-    if result is not None:
       ans, stores = result
       fun.populate_stores(stores)
-    else:
-      ans = call(fun, *args)
-      cache[key] = (ans, fun.stores)
 
     return ans
 
@@ -366,10 +525,18 @@ def clear_all_caches():
   for clear in cache_clearing_funs:
     clear()
 
-@partial(partial, tree_map)
 def _copy_main_traces(x):
+  # Walks the pytree directly, like tree_util._replace_nones, rather than
+  # flattening and unflattening it with tree_map.
   if isinstance(x, core.MainTrace):
     return core.MainTrace(x.level, x.trace_type, **x.payload)
+  handler = tree_util._registry.get(type(x))
+  if handler:
+    children, metadata = handler.to_iter(x)
+    return handler.from_iter(metadata, [_copy_main_traces(c) for c in children])
+  elif isinstance(x, tuple) and hasattr(x, '_fields'):
+    # handle namedtuple as a special case, based on heuristic
+    return type(x)(*map(_copy_main_traces, x))
   else:
     return x
 
@@ -380,6 +547,21 @@ def hashable_partial(*args):
 
 
 def merge_linear_aux(aux1, aux2):
+  store1 = getattr(aux1, 'store', None)
+  store2 = getattr(aux2, 'store', None)
+  if store1 is None or store2 is None:
+    return _merge_linear_aux_thunks(aux1, aux2)
+  # Both thunks come from transformation_with_aux, so check the stores'
+  # occupancy directly rather than raising and catching StoreExceptions.
+  if store1:
+    if store2:
+      raise StoreException("both stores occupied")
+    return True, store1.val
+  if store2:
+    return False, store2.val
+  raise StoreException("neither store occupied")
+
+def _merge_linear_aux_thunks(aux1, aux2):
   try:
     out1 = aux1()
   except StoreException:
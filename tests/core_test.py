@@ -410,6 +410,98 @@ class CoreTest(jtu.JaxTestCase):
     self.assertLen(e1.outvars, 1)  # only primal out, no residuals
     self.assertEqual(e1.outvars[0].aval.shape, (3, 3))  # only primal out shape
 
+  def test_lu_cache_caches_none_result(self):
+    calls = []
+
+    @lu.cache
+    def cached_call(fun, x):
+      calls.append(x)
+      return None
+
+    fun = lu.wrap_init(lambda x: x)
+    self.assertIsNone(cached_call(fun, 1))
+    self.assertIsNone(cached_call(fun, 1))
+    self.assertEqual(calls, [1])
+
+  def test_wrapped_fun_lazy_transform_stack(self):
+    @lu.transformation
+    def add(y, x):
+      ans = yield (x + y,), {}
+      yield ans
+
+    @lu.transformation_with_aux
+    def double_with_aux(x):
+      ans = yield (2 * x,), {}
+      yield ans, ans
+
+    def build():
+      f0 = lu.wrap_init(lambda x: x * 10)
+      f1 = add(f0, 1)
+      f2 = add(f1, 2)
+      f3, aux = double_with_aux(f2)
+      return f1, f2, f3, aux
+
+    f1, f2, f3, aux = build()
+    # Call the single- and two-transform WrappedFuns before the outer one.
+    self.assertEqual(f1.call_wrapped(0), 10)
+    self.assertEqual(f2.call_wrapped(0), 30)
+    self.assertEqual(f3.call_wrapped(1), 50)
+    self.assertEqual(aux(), 50)
+
+    # The stack is ordered outermost transform first, as when built eagerly.
+    self.assertEqual([args for _, args in f3.transforms], [(), (2,), (1,)])
+    self.assertEqual(f3.transforms[1:], f2.transforms)
+    self.assertEqual(f2.transforms[1:], f1.transforms)
+    self.assertIsNotNone(f3.stores[0])
+    self.assertEqual(f3.stores[1:], (None, None))
+    self.assertEqual(f2.stores, (None, None))
+
+    # populate_stores on a WrappedFun whose stack hasn't been built yet.
+    _, _, g3, g_aux = build()
+    g3.populate_stores(f3.stores)
+    self.assertEqual(g_aux(), 50)
+
+  def test_merge_linear_aux(self):
+    @lu.transformation_with_aux
+    def with_aux(x):
+      ans = yield (x,), {}
+      yield ans, ans + 1
+
+    def aux_thunk(called, use_eq_store=False):
+      f, aux = with_aux(lu.wrap_init(lambda x: x), use_eq_store=use_eq_store)
+      if called:
+        f.call_wrapped(1)
+      return aux
+
+    self.assertEqual(lu.merge_linear_aux(aux_thunk(True), aux_thunk(False)),
+                     (True, 2))
+    self.assertEqual(lu.merge_linear_aux(aux_thunk(False), aux_thunk(True)),
+                     (False, 2))
+    self.assertEqual(
+        lu.merge_linear_aux(aux_thunk(False, use_eq_store=True),
+                            aux_thunk(True, use_eq_store=True)),
+        (False, 2))
+    with self.assertRaisesRegex(lu.StoreException, "both stores occupied"):
+      lu.merge_linear_aux(aux_thunk(True), aux_thunk(True, use_eq_store=True))
+    with self.assertRaisesRegex(lu.StoreException, "neither store occupied"):
+      lu.merge_linear_aux(aux_thunk(False, use_eq_store=True), aux_thunk(False))
+
+    # Thunks not made by transformation_with_aux fall back to calling them.
+    def empty():
+      raise lu.StoreException("Store empty")
+    self.assertEqual(lu.merge_linear_aux(lambda: 3, empty), (True, 3))
+    self.assertEqual(lu.merge_linear_aux(empty, aux_thunk(True)), (False, 2))
+    with self.assertRaisesRegex(lu.StoreException, "neither store occupied"):
+      lu.merge_linear_aux(empty, aux_thunk(False))
+
+  def test_equal_store_truthiness(self):
+    store = lu.EqualStore()
+    self.assertFalse(store)
+    store.store(1)
+    self.assertTrue(store)
+    store.reset()
+    self.assertFalse(store)
+
 
 @jtu.with_config(jax_pprint_use_color=False)
 class JaxprTypeChecks(jtu.JaxTestCase):